@@ -1,7 +1,87 @@
-from typing import Any, Dict, List
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
 from project.core.a2a_protocol import PlannerPlan, WorkerResult, EvaluatorDecision
 from project.core.context_engineering import build_evaluator_prompt
 from project.core.observability import log_event
+from project.tools.tools import (
+    get_emergency_protocol,
+    get_local_emergency_contacts,
+    summarize_protocol,
+    LIFE_THREATENING_WARNING,
+    PROTOCOLS,
+    CONTACT_REGION_KEYWORDS,
+)
+
+
+# Constant response fragments, interned once at import time.
+HEADER = "Emergency Response Guide Agent\n\n"
+DISCLAIMER = (
+    "Important: This is not a substitute for professional medical or emergency services. "
+    "If you are in immediate danger or unsure, contact your local emergency number right away.\n\n"
+)
+ESCALATION_LINE = (
+    "⚠️ This situation may be serious. If possible, stop reading and call your local emergency number immediately.\n\n"
+)
+ALERTS_LINE = "There may be active alerts in your area. Always follow instructions from local authorities.\n"
+PROMPT_APPLIED_LINE = "\n(Internal evaluator prompt applied for safety and clarity.)\n"
+
+STEPS_TITLE = "Recommended steps:\n"
+WARNINGS_TITLE = "\nWarnings:\n"
+LOCAL_INFO_TITLE = "\nLocal emergency information:\n"
+NOTES_TITLE = "\nNotes:\n"
+
+# Keys used to pre-render blocks for the built-in knowledge base.
+KNOWN_EMERGENCY_TYPES = list(PROTOCOLS)
+# "global" matches no region keyword, so it covers the default contact.
+KNOWN_REGIONS = ["global"] + [region_key for region_key, _ in CONTACT_REGION_KEYWORDS]
+
+
+@lru_cache(maxsize=512)
+def _render_list_block(title: str, items: Tuple[str, ...]) -> str:
+    """
+    Render a titled bullet list. Cached on the (hashable) item tuple, so blocks
+    for a given protocol or region are only rendered once.
+    """
+    if not items:
+        return ""
+    return title + "".join([f"- {item}\n" for item in items])
+
+
+@lru_cache(maxsize=512)
+def _render_details_line(emergency_type: str, severity: str) -> str:
+    return f"Detected emergency type: {emergency_type} (severity: {severity}).\n"
+
+
+@lru_cache(maxsize=512)
+def _render_prompt_summary(emergency_type: str, severity: str, risk_score: int) -> str:
+    prompt_used = build_evaluator_prompt(
+        emergency_type=emergency_type,
+        severity=severity,
+        risk_score=risk_score,
+    )
+    return f"(Evaluator prompt summary: {prompt_used[:200]}...)\n"
+
+
+def _local_info_items(local_info: Dict[str, Any]) -> Tuple[str, ...]:
+    return tuple([f"{k}: {v}" for k, v in local_info.items()])
+
+
+def _warm_fragment_cache() -> None:
+    """
+    Pre-render the step, warning and local-info blocks for every built-in protocol and region key.
+    """
+    _render_list_block(WARNINGS_TITLE, (LIFE_THREATENING_WARNING,))
+
+    for emergency_type in KNOWN_EMERGENCY_TYPES:
+        protocol_text = get_emergency_protocol(emergency_type=emergency_type, severity="low", region="global")
+        steps = summarize_protocol(protocol_text, max_steps=7)
+        _render_list_block(STEPS_TITLE, tuple([f"Step {i}: {step}" for i, step in enumerate(steps, start=1)]))
+
+    for region in KNOWN_REGIONS:
+        _render_list_block(LOCAL_INFO_TITLE, _local_info_items(get_local_emergency_contacts(region=region)))
+
+
+_warm_fragment_cache()
 
 
 class EvaluatorAgent:
@@ -22,84 +102,62 @@ class EvaluatorAgent:
             return True
         return False
 
+    def _build_response_blocks(
+        self,
+        plan: PlannerPlan,
+        worker_result: WorkerResult,
+        escalate: bool,
+    ) -> Dict[str, Any]:
+        """
+        Structured view of the final answer, returned to clients alongside the text.
+        """
+        return {
+            "emergency_type": plan.emergency_type,
+            "severity": plan.severity,
+            "escalation": escalate,
+            "has_alerts": bool(worker_result.alerts),
+            "steps": list(worker_result.steps),
+            "warnings": list(worker_result.warnings),
+            "local_info": dict(worker_result.local_info),
+            "notes": list(worker_result.uncertainties),
+        }
+
     def _build_response_text(
         self,
         plan: PlannerPlan,
         worker_result: WorkerResult,
         escalate: bool,
     ) -> str:
-        header = "Emergency Response Guide Agent\n\n"
-        disclaimer = (
-            "Important: This is not a substitute for professional medical or emergency services. "
-            "If you are in immediate danger or unsure, contact your local emergency number right away.\n\n"
-        )
-
-        escalation_line = ""
+        parts: List[str] = [HEADER, DISCLAIMER]
         if escalate:
-            escalation_line = (
-                "⚠️ This situation may be serious. If possible, stop reading and call your local emergency number immediately.\n\n"
-            )
-
-        details: List[str] = []
-        details.append(f"Detected emergency type: {plan.emergency_type} (severity: {plan.severity}).")
+            parts.append(ESCALATION_LINE)
 
+        parts.append(_render_details_line(plan.emergency_type, plan.severity))
         if worker_result.alerts:
-            details.append("There may be active alerts in your area. Always follow instructions from local authorities.")
-
-        steps_block = ""
-        if worker_result.steps:
-            steps_block = "Recommended steps:\n"
-            for step in worker_result.steps:
-                steps_block += f"- {step}\n"
-
-        warnings_block = ""
-        if worker_result.warnings:
-            warnings_block = "\nWarnings:\n"
-            for w in worker_result.warnings:
-                warnings_block += f"- {w}\n"
-
-        local_info_block = ""
-        if worker_result.local_info:
-            local_info_block = "\nLocal emergency information:\n"
-            for k, v in worker_result.local_info.items():
-                local_info_block += f"- {k}: {v}\n"
-
-        uncertainties_block = ""
-        if worker_result.uncertainties:
-            uncertainties_block = "\nNotes:\n"
-            for u in worker_result.uncertainties:
-                uncertainties_block += f"- {u}\n"
-
-        body = ""
-        for d in details:
-            body += d + "\n"
-        body += "\n"
-        body += steps_block
-        body += warnings_block
-        body += local_info_block
-        body += uncertainties_block
-
-        prompt_used = build_evaluator_prompt(
-            emergency_type=plan.emergency_type,
-            severity=plan.severity,
-            risk_score=worker_result.risk_score,
-        )
+            parts.append(ALERTS_LINE)
+        parts.append("\n")
+
+        parts.append(_render_list_block(STEPS_TITLE, tuple(worker_result.steps)))
+        parts.append(_render_list_block(WARNINGS_TITLE, tuple(worker_result.warnings)))
+        parts.append(_render_list_block(LOCAL_INFO_TITLE, _local_info_items(worker_result.local_info)))
+        parts.append(_render_list_block(NOTES_TITLE, tuple(worker_result.uncertainties)))
 
-        full_response = header + disclaimer + escalation_line + body + "\n"
-        full_response += "\n(Internal evaluator prompt applied for safety and clarity.)\n"
-        full_response += f"(Evaluator prompt summary: {prompt_used[:200]}...)\n"
+        parts.append("\n")
+        parts.append(PROMPT_APPLIED_LINE)
+        parts.append(_render_prompt_summary(plan.emergency_type, plan.severity, worker_result.risk_score))
 
-        return full_response
+        return "".join(parts)
 
     def evaluate(self, plan: PlannerPlan, worker_result: WorkerResult) -> EvaluatorDecision:
         log_event(
             agent_name="EvaluatorAgent",
             event_type="evaluate_start",
-            data={"plan_id": plan.plan_id, "risk_score": worker_result.risk_score},
+            data={"request_id": plan.request_id, "plan_id": plan.plan_id, "risk_score": worker_result.risk_score},
         )
 
         escalate = self._needs_escalation(plan, worker_result)
         response_text = self._build_response_text(plan, worker_result, escalate)
+        response_blocks = self._build_response_blocks(plan, worker_result, escalate)
 
         risk_flags: List[str] = []
         if escalate:
@@ -111,12 +169,13 @@ class EvaluatorAgent:
             risk_flags=risk_flags,
             escalation_advice=escalate,
             notes_for_logs="Evaluation complete.",
+            response_blocks=response_blocks,
         )
 
         log_event(
             agent_name="EvaluatorAgent",
             event_type="evaluate_end",
-            data={"plan_id": plan.plan_id, "escalation": escalate},
+            data={"request_id": plan.request_id, "plan_id": plan.plan_id, "escalation": escalate},
         )
 
         return decision
@@ -53,7 +53,11 @@ class PlannerAgent:
         log_event(
             agent_name="PlannerAgent",
             event_type="plan_start",
-            data={"session_id": user_message.session_id, "text": user_message.text},
+            data={
+                "request_id": user_message.request_id,
+                "session_id": user_message.session_id,
+                "text": user_message.text,
+            },
         )
 
         classification = self._simple_classify(user_message.text)
@@ -104,12 +108,14 @@ class PlannerAgent:
             desired_output_format=desired_output_format,
             session_summary_snapshot=session_summary,
             raw_prompt=prompt,
+            request_id=user_message.request_id,
         )
 
         log_event(
             agent_name="PlannerAgent",
             event_type="plan_end",
             data={
+                "request_id": plan.request_id,
                 "session_id": user_message.session_id,
                 "plan_id": plan.plan_id,
                 "emergency_type": emergency_type,
@@ -7,6 +7,7 @@ from project.tools.tools import (
     get_disaster_alerts,
     summarize_protocol,
     compute_risk_score,
+    LIFE_THREATENING_WARNING,
 )
 
 
@@ -25,7 +26,7 @@ class WorkerAgent:
         log_event(
             agent_name="WorkerAgent",
             event_type="work_start",
-            data={"plan_id": plan.plan_id, "emergency_type": plan.emergency_type},
+            data={"request_id": plan.request_id, "plan_id": plan.plan_id, "emergency_type": plan.emergency_type},
         )
 
         session_region = plan.session_summary_snapshot.get("region", "global")
@@ -59,9 +60,7 @@ class WorkerAgent:
         summarized_steps = summarize_protocol(protocol_text, max_steps=7)
 
         if risk_score >= 8:
-            warnings.append(
-                "This situation appears potentially life-threatening. Call your local emergency number immediately if you can."
-            )
+            warnings.append(LIFE_THREATENING_WARNING)
 
         if not protocol_text:
             uncertainties.append(
@@ -92,6 +91,7 @@ class WorkerAgent:
             agent_name="WorkerAgent",
             event_type="work_end",
             data={
+                "request_id": plan.request_id,
                 "plan_id": plan.plan_id,
                 "num_steps": len(steps),
                 "risk_score": risk_score,
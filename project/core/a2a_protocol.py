@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Dict, List
 
 
@@ -9,6 +9,7 @@ class UserMessage:
     text: str
     timestamp: float
     metadata: Dict[str, Any]
+    request_id: str = ""
 
 
 @dataclass
@@ -22,6 +23,7 @@ class PlannerPlan:
     desired_output_format: str
     session_summary_snapshot: Dict[str, Any]
     raw_prompt: str
+    request_id: str = ""
 
 
 @dataclass
@@ -43,3 +45,4 @@ class EvaluatorDecision:
     risk_flags: List[str]
     escalation_advice: bool
     notes_for_logs: str
+    response_blocks: Dict[str, Any] = field(default_factory=dict)
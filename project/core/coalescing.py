@@ -0,0 +1,104 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import threading
+import time
+
+
+def normalize_message_text(text: str) -> str:
+    """
+    Normalize user text for duplicate detection.
+
+    Only changes that cannot alter the Planner's keyword classification are
+    applied: lowercasing and trimming surrounding whitespace and punctuation.
+    """
+    return text.lower().strip().strip(".!?").strip()
+
+
+class _InFlightCall:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class MessageCoalescer:
+    """
+    Coalesces duplicate messages in front of the agent pipeline.
+
+    - Single-flight: concurrent calls with the same key share one execution
+      and its result (or exception).
+    - Dedupe window: the last result per session is reused for an identical
+      key seen again within `dedupe_window` seconds.
+    """
+
+    def __init__(self, dedupe_window: float = 10.0, max_sessions: int = 10000) -> None:
+        self.dedupe_window = dedupe_window
+        self.max_sessions = max_sessions
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, _InFlightCall] = {}
+        # session_id -> (key, result, expires_at), oldest first. The window is
+        # fixed, so insertion order is also expiry order.
+        self._recent: "OrderedDict[str, Tuple[Hashable, Any, float]]" = OrderedDict()
+
+    def run(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run `fn` unless an identical call is already in flight, in which case
+        wait for it and share its result.
+        Returns (result, leader) where leader is True if this call ran `fn`.
+        """
+        with self._lock:
+            call = self._in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = _InFlightCall()
+                self._in_flight[key] = call
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, False
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            call.done.set()
+        return call.result, True
+
+    def lookup_recent(self, session_id: str, key: Hashable) -> Optional[Any]:
+        if self.dedupe_window <= 0:
+            return None
+        with self._lock:
+            entry = self._recent.get(session_id)
+        if entry is None:
+            return None
+        recent_key, result, expires_at = entry
+        if recent_key != key or time.monotonic() >= expires_at:
+            return None
+        return result
+
+    def remember(self, session_id: str, key: Hashable, result: Any) -> None:
+        if self.dedupe_window <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._recent[session_id] = (key, result, now + self.dedupe_window)
+            self._recent.move_to_end(session_id)
+            # Drop expired entries, then the oldest live ones beyond max_sessions
+            while self._recent and next(iter(self._recent.values()))[2] <= now:
+                self._recent.popitem(last=False)
+            while len(self._recent) > self.max_sessions:
+                self._recent.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._recent.clear()
+
+
+# Global singleton, shared like GLOBAL_SESSION_MEMORY
+GLOBAL_MESSAGE_COALESCER = MessageCoalescer()
@@ -0,0 +1,447 @@
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import atexit
+import json
+import os
+import struct
+import threading
+import time
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pa_ipc = None
+
+from project.core.observability import add_log_sink
+
+
+# Column name -> type. "f64" is a float64 array, "i8" an int8 array
+# (-1 = unknown, 0 = false, 1 = true), "str" a UTF-8 string column ("" = missing).
+EVENT_COLUMNS: Dict[str, str] = {
+    "timestamp": "f64",
+    "agent": "str",
+    "event_type": "str",
+    "severity": "str",
+    "request_id": "str",
+    "session_id": "str",
+    "plan_id": "str",
+    "emergency_type": "str",
+    "region": "str",
+    "escalation": "i8",
+    "data": "str",
+}
+
+# Events that close a handled user message, including messages answered with
+# a shared result from the coalescer.
+REQUEST_END_EVENTS = ("handle_message_end", "handle_message_coalesced", "handle_message_deduplicated")
+
+ARROW_SUFFIX = ".arrow"
+COLS_SUFFIX = ".cols"
+
+# Simple columnar chunk layout:
+#   magic (8 bytes), header length (u32), JSON header, column payloads.
+# The header maps each column to {"type", "offset", "length"}; offsets are
+# relative to the first byte after the header.
+# A "str" payload is (rows + 1) int64 end offsets followed by the UTF-8 bytes.
+COLS_MAGIC = b"ERGACOL1"
+_COLS_PREFIX = struct.Struct("<8sI")
+
+
+def _empty_columns() -> Dict[str, Any]:
+    columns: Dict[str, Any] = {}
+    for name, kind in EVENT_COLUMNS.items():
+        if kind == "f64":
+            columns[name] = array("d")
+        elif kind == "i8":
+            columns[name] = array("b")
+        else:
+            columns[name] = []
+    return columns
+
+
+def _missing_column(name: str, rows: int) -> Any:
+    """
+    Placeholder values for a column absent from an older chunk.
+    """
+    kind = EVENT_COLUMNS[name]
+    if kind == "f64":
+        return array("d", [0.0] * rows)
+    if kind == "i8":
+        return array("b", [-1] * rows)
+    return [""] * rows
+
+
+def _escalation_value(data: Dict[str, Any]) -> int:
+    value = data.get("escalation_advice", data.get("escalation"))
+    if value is None:
+        return -1
+    return 1 if value else 0
+
+
+def _encode_str_column(values: List[str]) -> bytes:
+    ends = array("q")
+    encoded: List[bytes] = []
+    position = 0
+    ends.append(0)
+    for value in values:
+        raw = value.encode("utf-8")
+        encoded.append(raw)
+        position += len(raw)
+        ends.append(position)
+    return ends.tobytes() + b"".join(encoded)
+
+
+def _decode_str_column(payload: bytes, rows: int) -> List[str]:
+    ends = array("q")
+    ends.frombytes(payload[: (rows + 1) * 8])
+    text = payload[(rows + 1) * 8:]
+    return [text[ends[i]:ends[i + 1]].decode("utf-8") for i in range(rows)]
+
+
+def _remove_tmp(tmp_path: str) -> None:
+    try:
+        os.unlink(tmp_path)
+    except OSError:
+        pass
+
+
+def _write_cols_chunk(path: str, columns: Dict[str, Any], rows: int) -> None:
+    payloads: List[Tuple[str, str, bytes]] = []
+    for name, kind in EVENT_COLUMNS.items():
+        if kind == "str":
+            payloads.append((name, kind, _encode_str_column(columns[name])))
+        else:
+            payloads.append((name, kind, columns[name].tobytes()))
+
+    header_layout: Dict[str, Any] = {"rows": rows, "columns": {}}
+    offset = 0
+    for name, kind, payload in payloads:
+        header_layout["columns"][name] = {"type": kind, "offset": offset, "length": len(payload)}
+        offset += len(payload)
+    header = json.dumps(header_layout).encode("utf-8")
+
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(_COLS_PREFIX.pack(COLS_MAGIC, len(header)))
+            f.write(header)
+            for _, _, payload in payloads:
+                f.write(payload)
+        os.replace(tmp_path, path)
+    except Exception:
+        _remove_tmp(tmp_path)
+        raise
+
+
+def _read_cols_chunk(path: str, names: List[str]) -> Dict[str, Any]:
+    """
+    Read only the requested columns from a simple columnar chunk.
+    """
+    with open(path, "rb") as f:
+        magic, header_len = _COLS_PREFIX.unpack(f.read(_COLS_PREFIX.size))
+        if magic != COLS_MAGIC:
+            raise ValueError(f"Not an event chunk: {path}")
+        header = json.loads(f.read(header_len).decode("utf-8"))
+        rows = header["rows"]
+        payload_start = _COLS_PREFIX.size + header_len
+
+        result: Dict[str, Any] = {}
+        for name in names:
+            meta = header["columns"].get(name)
+            if meta is None:
+                result[name] = _missing_column(name, rows)
+                continue
+            f.seek(payload_start + meta["offset"])
+            payload = f.read(meta["length"])
+            if meta["type"] == "str":
+                result[name] = _decode_str_column(payload, rows)
+            else:
+                values = array("d" if meta["type"] == "f64" else "b")
+                values.frombytes(payload)
+                result[name] = values
+        return result
+
+
+def _write_arrow_chunk(path: str, columns: Dict[str, Any]) -> None:
+    types = {"f64": pa.float64(), "i8": pa.int8(), "str": pa.string()}
+    table = pa.table(
+        {name: pa.array(list(columns[name]), type=types[kind]) for name, kind in EVENT_COLUMNS.items()}
+    )
+    tmp_path = path + ".tmp"
+    try:
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa_ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+    except Exception:
+        _remove_tmp(tmp_path)
+        raise
+
+
+def _read_arrow_chunk(path: str, names: List[str]) -> Dict[str, Any]:
+    # Memory-mapped, so only the pages of the selected columns are touched.
+    with pa.memory_map(path, "r") as source:
+        table = pa_ipc.open_file(source).read_all()
+        present = [n for n in names if n in table.schema.names]
+        result = table.select(present).to_pydict()
+        for name in names:
+            if name not in result:
+                result[name] = _missing_column(name, table.num_rows)
+        return result
+
+
+class ColumnarEventSink:
+    """
+    Log sink that buffers events column by column and writes them to
+    `directory` in chunks of `chunk_size` rows, or sooner once the oldest
+    buffered event is `max_age` seconds old.
+
+    Chunks are Arrow IPC files when pyarrow is installed (and `use_arrow`
+    is not False), otherwise a simple array-backed format.
+    Common `data` fields are promoted to their own columns; the full
+    `data` dict is kept as a JSON column.
+
+    If a chunk cannot be written, its rows are dropped (counted in
+    `dropped_rows`) and the error is raised to log_event, so a broken disk
+    never grows the buffer beyond one chunk.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        chunk_size: int = 10000,
+        use_arrow: Optional[bool] = None,
+        max_age: float = 60.0,
+    ) -> None:
+        if use_arrow and pa is None:
+            raise ImportError("pyarrow is required for use_arrow=True")
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.max_age = max_age
+        self.use_arrow = pa is not None if use_arrow is None else use_arrow
+        self._lock = threading.Lock()
+        self._columns = _empty_columns()
+        self._rows = 0
+        self._oldest_row_at = 0.0
+        self._chunk_seq = 0
+        self.dropped_rows = 0
+        self._stopped = threading.Event()
+        os.makedirs(directory, exist_ok=True)
+
+    def __call__(self, record: Dict[str, Any]) -> None:
+        data = record.get("data") or {}
+        with self._lock:
+            columns = self._columns
+            columns["timestamp"].append(float(record.get("timestamp", time.time())))
+            columns["agent"].append(str(record.get("agent", "")))
+            columns["event_type"].append(str(record.get("event_type", "")))
+            columns["severity"].append(str(record.get("severity", "")))
+            columns["request_id"].append(str(data.get("request_id", "")))
+            columns["session_id"].append(str(data.get("session_id", "")))
+            columns["plan_id"].append(str(data.get("plan_id", "")))
+            columns["emergency_type"].append(str(data.get("emergency_type", "")))
+            columns["region"].append(str(data.get("region", "")))
+            columns["escalation"].append(_escalation_value(data))
+            columns["data"].append(json.dumps(data, default=str))
+            if self._rows == 0:
+                self._oldest_row_at = time.monotonic()
+            self._rows += 1
+            if self._rows >= self.chunk_size or self._is_stale_locked():
+                self._flush_locked()
+
+    def _is_stale_locked(self) -> bool:
+        return self._rows > 0 and self.max_age > 0 and time.monotonic() - self._oldest_row_at >= self.max_age
+
+    def flush_if_stale(self) -> Optional[str]:
+        """
+        Flush only if the oldest buffered event has reached `max_age`.
+        """
+        with self._lock:
+            if not self._is_stale_locked():
+                return None
+            return self._flush_locked()
+
+    def run_flush_timer(self) -> None:
+        """
+        Flush stale buffers every `max_age` seconds until close(), so a quiet
+        process still makes its last events visible to EventStore.
+        """
+        while not self._stopped.wait(self.max_age):
+            self.flush_if_stale()
+
+    def close(self) -> None:
+        self._stopped.set()
+        self.flush()
+
+    def flush(self) -> Optional[str]:
+        """
+        Write buffered events as a new chunk. Returns the chunk path, if any.
+        """
+        with self._lock:
+            return self._flush_locked()
+
+    def _flush_locked(self) -> Optional[str]:
+        if self._rows == 0:
+            return None
+
+        # Millisecond timestamp first so chunks sort in write order across processes.
+        name = f"events-{int(time.time() * 1000):015d}-{os.getpid()}-{self._chunk_seq:06d}"
+        self._chunk_seq += 1
+        columns, rows = self._columns, self._rows
+        # Reset first, so a failed write drops this chunk instead of retrying it on every append
+        self._columns = _empty_columns()
+        self._rows = 0
+
+        try:
+            if self.use_arrow:
+                path = os.path.join(self.directory, name + ARROW_SUFFIX)
+                _write_arrow_chunk(path, columns)
+            else:
+                path = os.path.join(self.directory, name + COLS_SUFFIX)
+                _write_cols_chunk(path, columns, rows)
+        except Exception:
+            self.dropped_rows += rows
+            raise
+        return path
+
+
+def enable_event_store(
+    directory: str,
+    chunk_size: int = 10000,
+    use_arrow: Optional[bool] = None,
+    max_age: float = 60.0,
+) -> ColumnarEventSink:
+    """
+    Attach a ColumnarEventSink to log_event, flush it in the background every
+    `max_age` seconds and at interpreter exit.
+    """
+    sink = ColumnarEventSink(directory, chunk_size=chunk_size, use_arrow=use_arrow, max_age=max_age)
+    add_log_sink(sink)
+    if max_age > 0:
+        threading.Thread(target=sink.run_flush_timer, name="event-store-flush", daemon=True).start()
+    atexit.register(sink.close)
+    return sink
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class EventStore:
+    """
+    Read-only query API over the chunks written by ColumnarEventSink.
+    Every query reads only the columns it needs.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+
+    def chunk_paths(self) -> List[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        names = [
+            n for n in os.listdir(self.directory)
+            if n.startswith("events-") and n.endswith((ARROW_SUFFIX, COLS_SUFFIX))
+        ]
+        return [os.path.join(self.directory, n) for n in sorted(names)]
+
+    def scan(self, columns: List[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield one {column: values} dict per chunk, in write order.
+        """
+        unknown = [c for c in columns if c not in EVENT_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown event columns: {', '.join(unknown)}")
+
+        for path in self.chunk_paths():
+            if path.endswith(ARROW_SUFFIX):
+                if pa is None:
+                    raise ImportError(f"pyarrow is required to read {path}")
+                yield _read_arrow_chunk(path, columns)
+            else:
+                yield _read_cols_chunk(path, columns)
+
+    def latency_by_stage(self, max_pending: int = 100000) -> Dict[str, Dict[str, float]]:
+        """
+        Seconds between each `<stage>_start` and `<stage>_end` event, summarized per stage.
+
+        Events are paired on request_id (falling back to session_id or plan_id
+        for events logged without one). At most `max_pending` unmatched starts
+        are tracked; the oldest are dropped first, so starts of failed requests
+        cannot grow without bound.
+        """
+        pending: Dict[Tuple[str, str], float] = {}
+        durations: Dict[str, List[float]] = {}
+
+        for chunk in self.scan(["timestamp", "event_type", "request_id", "session_id", "plan_id"]):
+            timestamps = chunk["timestamp"]
+            event_types = chunk["event_type"]
+            request_ids = chunk["request_id"]
+            session_ids = chunk["session_id"]
+            plan_ids = chunk["plan_id"]
+            for i in range(len(event_types)):
+                event_type = event_types[i]
+                correlation_id = request_ids[i] or session_ids[i] or plan_ids[i]
+                if event_type.endswith("_start"):
+                    pending[(event_type[: -len("_start")], correlation_id)] = timestamps[i]
+                    if len(pending) > max_pending:
+                        del pending[next(iter(pending))]
+                elif event_type.endswith("_end"):
+                    stage = event_type[: -len("_end")]
+                    started = pending.pop((stage, correlation_id), None)
+                    if started is not None:
+                        durations.setdefault(stage, []).append(timestamps[i] - started)
+
+        summary: Dict[str, Dict[str, float]] = {}
+        for stage, values in durations.items():
+            values.sort()
+            summary[stage] = {
+                "count": len(values),
+                "mean": sum(values) / len(values),
+                "p50": _percentile(values, 0.5),
+                "p95": _percentile(values, 0.95),
+                "max": values[-1],
+            }
+        return summary
+
+    def emergency_type_mix(self, bucket_seconds: float = 3600.0) -> Dict[float, Dict[str, int]]:
+        """
+        Count of handled messages per emergency type, per time bucket.
+        Keys are bucket start timestamps.
+        """
+        mix: Dict[float, Dict[str, int]] = {}
+        for chunk in self.scan(["timestamp", "event_type", "emergency_type"]):
+            timestamps = chunk["timestamp"]
+            event_types = chunk["event_type"]
+            emergency_types = chunk["emergency_type"]
+            for i in range(len(event_types)):
+                if event_types[i] not in REQUEST_END_EVENTS or not emergency_types[i]:
+                    continue
+                bucket = timestamps[i] - (timestamps[i] % bucket_seconds)
+                counts = mix.setdefault(bucket, {})
+                counts[emergency_types[i]] = counts.get(emergency_types[i], 0) + 1
+        return dict(sorted(mix.items()))
+
+    def escalation_rate_by_region(self) -> Dict[str, Dict[str, float]]:
+        """
+        Share of handled messages that advised escalation, per region.
+        """
+        totals: Dict[str, List[int]] = {}
+        for chunk in self.scan(["event_type", "region", "escalation"]):
+            event_types = chunk["event_type"]
+            regions = chunk["region"]
+            escalations = chunk["escalation"]
+            for i in range(len(event_types)):
+                if event_types[i] not in REQUEST_END_EVENTS or escalations[i] < 0:
+                    continue
+                counts = totals.setdefault(regions[i] or "unknown", [0, 0])
+                counts[0] += 1
+                counts[1] += escalations[i]
+
+        return {
+            region: {"requests": requests, "escalations": escalated, "rate": escalated / requests}
+            for region, (requests, escalated) in totals.items()
+        }
@@ -1,9 +1,25 @@
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List
 import json
 import time
 import sys
 
 
+# Optional extra destinations for log records (e.g. a ColumnarEventSink).
+_LOG_SINKS: List[Callable[[Dict[str, Any]], None]] = []
+
+
+def add_log_sink(sink: Callable[[Dict[str, Any]], None]) -> None:
+    """
+    Register a callable that receives every log record after it is written to stdout.
+    """
+    _LOG_SINKS.append(sink)
+
+
+def remove_log_sink(sink: Callable[[Dict[str, Any]], None]) -> None:
+    if sink in _LOG_SINKS:
+        _LOG_SINKS.remove(sink)
+
+
 def log_event(agent_name: str, event_type: str, data: Dict[str, Any], severity: str = "info") -> None:
     """
     Simple JSON logging to stdout.
@@ -21,3 +37,10 @@ def log_event(agent_name: str, event_type: str, data: Dict[str, Any], severity:
     except Exception:
         # Fallback to plain print if JSON serialization fails
         print(f"[LOG][{agent_name}][{event_type}] {data}")
+
+    for sink in _LOG_SINKS:
+        try:
+            sink(log_record)
+        except Exception as e:
+            # A broken sink must never break the agent pipeline
+            print(f"[LOG][sink error] {e}")
@@ -1,10 +1,13 @@
+import copy
 import time
-from typing import Any, Dict
+import uuid
+from typing import Any, Dict, Optional, Tuple
 
 from project.agents.planner import PlannerAgent
 from project.agents.worker import WorkerAgent
 from project.agents.evaluator import EvaluatorAgent
 from project.core.a2a_protocol import UserMessage
+from project.core.coalescing import GLOBAL_MESSAGE_COALESCER, MessageCoalescer, normalize_message_text
 from project.core.observability import log_event
 from project.memory.session_memory import GLOBAL_SESSION_MEMORY
 
@@ -14,60 +17,133 @@ class MainAgent:
     Orchestrates Planner -> Worker -> Evaluator.
     """
 
-    def __init__(self, user_id: str = "demo_user") -> None:
+    def __init__(self, user_id: str = "demo_user", coalescer: Optional[MessageCoalescer] = None) -> None:
         self.user_id = user_id
         self.planner = PlannerAgent()
         self.worker = WorkerAgent()
         self.evaluator = EvaluatorAgent()
+        self.coalescer = coalescer if coalescer is not None else GLOBAL_MESSAGE_COALESCER
 
     def handle_message(self, user_input: str, session_id: str = "default_session") -> Dict[str, Any]:
-        timestamp = time.time()
         session_summary = GLOBAL_SESSION_MEMORY.get_session_summary(session_id)
         GLOBAL_SESSION_MEMORY.set_default_region_if_missing(session_id)
         GLOBAL_SESSION_MEMORY.set_default_language_if_missing(session_id)
 
+        # Unique per call, so log events of overlapping requests in one session can be told apart
+        request_id = uuid.uuid4().hex
+
+        # Duplicate messages (same normalized text, region and language) produce
+        # the same answer, so they share one pipeline run.
+        key = (
+            normalize_message_text(user_input),
+            session_summary.get("region", "global"),
+            session_summary.get("language", "en"),
+        )
+
+        recent = self.coalescer.lookup_recent(session_id, key)
+        if recent is not None:
+            self._log_shared_result(
+                "handle_message_deduplicated", request_id, session_id, user_input, key[1], recent
+            )
+            return copy.deepcopy(recent)
+
+        (result, session_update), leader = self.coalescer.run(
+            key,
+            lambda: self._run_pipeline(request_id, user_input, session_id, session_summary),
+        )
+        if not leader:
+            self._log_shared_result(
+                "handle_message_coalesced", request_id, session_id, user_input, key[1], result
+            )
+        GLOBAL_SESSION_MEMORY.update_session_summary(session_id, session_update)
+        self.coalescer.remember(session_id, key, result)
+
+        return copy.deepcopy(result)
+
+    def _log_shared_result(
+        self,
+        event_type: str,
+        request_id: str,
+        session_id: str,
+        user_input: str,
+        region: str,
+        result: Dict[str, Any],
+    ) -> None:
+        """
+        Single log event for a request answered with another run's result,
+        in place of the full pipeline's events.
+        """
+        log_event(
+            agent_name="MainAgent",
+            event_type=event_type,
+            data={
+                "request_id": request_id,
+                "session_id": session_id,
+                "text": user_input,
+                "emergency_type": result["blocks"].get("emergency_type"),
+                "region": region,
+                "escalation_advice": result["escalation_advice"],
+            },
+        )
+
+    def _run_pipeline(
+        self,
+        request_id: str,
+        user_input: str,
+        session_id: str,
+        session_summary: Dict[str, Any],
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Run Planner -> Worker -> Evaluator once.
+        Returns the response dict and the session summary update to apply.
+        """
+        timestamp = time.time()
         user_message = UserMessage(
             user_id=self.user_id,
             session_id=session_id,
             text=user_input,
             timestamp=timestamp,
             metadata={},
+            request_id=request_id,
         )
 
         log_event(
             agent_name="MainAgent",
             event_type="handle_message_start",
-            data={"session_id": session_id, "text": user_input},
+            data={"request_id": request_id, "session_id": session_id, "text": user_input},
         )
 
         plan = self.planner.plan(user_message=user_message, session_summary=session_summary)
         worker_result = self.worker.work(plan=plan)
         decision = self.evaluator.evaluate(plan=plan, worker_result=worker_result)
 
-        GLOBAL_SESSION_MEMORY.update_session_summary(
-            session_id,
-            {
-                "last_emergency_type": plan.emergency_type,
-                "last_severity": plan.severity,
-                "last_risk_score": worker_result.risk_score,
-            },
-        )
+        session_update = {
+            "last_emergency_type": plan.emergency_type,
+            "last_severity": plan.severity,
+            "last_risk_score": worker_result.risk_score,
+        }
 
         log_event(
             agent_name="MainAgent",
             event_type="handle_message_end",
             data={
+                "request_id": request_id,
                 "session_id": session_id,
                 "plan_id": plan.plan_id,
                 "risk_flags": decision.risk_flags,
+                "emergency_type": plan.emergency_type,
+                "region": session_summary.get("region", "global"),
+                "escalation_advice": decision.escalation_advice,
             },
         )
 
-        return {
+        result = {
             "response": decision.final_response_text,
             "risk_flags": decision.risk_flags,
             "escalation_advice": decision.escalation_advice,
+            "blocks": decision.response_blocks,
         }
+        return result, session_update
 
 
 def run_agent(user_input: str):
@@ -0,0 +1,225 @@
+from typing import Dict, List, Optional, Tuple
+import mmap
+import os
+import stat
+import struct
+import tempfile
+import time
+
+from project.core.observability import log_event
+
+
+# Blob layout (little endian):
+#   header: magic (8 bytes), entry count (u32), index size in bytes (u32)
+#   index:  per entry -> key length (u16), data offset (u32), data length (u32), key bytes
+#   data:   UTF-8 values, addressed by absolute offset
+MAGIC = b"ERGAKB\x00\x01"
+_HEADER = struct.Struct("<8sII")
+_ENTRY = struct.Struct("<HII")
+
+
+def build_knowledge_base(path: str, entries: Dict[str, str]) -> None:
+    """
+    Pack a flat key -> text table into an offset-indexed blob at `path`.
+
+    The blob is written to a temporary file in the same directory and then
+    swapped in with os.replace, so readers never observe a partial file.
+    The new file keeps the mode of the file it replaces (0644 for a new file),
+    so workers running as other users can still read it.
+    """
+    encoded: List[Tuple[bytes, bytes]] = [
+        (key.encode("utf-8"), value.encode("utf-8")) for key, value in sorted(entries.items())
+    ]
+    index_size = sum(_ENTRY.size + len(key) for key, _ in encoded)
+
+    index_parts: List[bytes] = []
+    data_parts: List[bytes] = []
+    offset = _HEADER.size + index_size
+    for key, value in encoded:
+        index_parts.append(_ENTRY.pack(len(key), offset, len(value)) + key)
+        data_parts.append(value)
+        offset += len(value)
+
+    blob = b"".join([_HEADER.pack(MAGIC, len(encoded), index_size)] + index_parts + data_parts)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o644
+
+    fd, tmp_path = tempfile.mkstemp(prefix=".kb-", dir=directory)
+    try:
+        # mkstemp creates the file as 0600
+        os.fchmod(fd, mode)
+        with os.fdopen(fd, "wb") as f:
+            f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class _Mapping:
+    """
+    One mapped version of the blob: the mmap, the key index, a prefix index
+    and the file signature it was loaded from.
+    """
+
+    def __init__(
+        self,
+        mm: mmap.mmap,
+        index: Dict[str, Tuple[int, int]],
+        groups: Dict[str, List[Tuple[str, int, int]]],
+        signature: Tuple[int, int, int],
+    ) -> None:
+        self.mm = mm
+        self.index = index
+        # "prefix" -> [(field, offset, length)] for every "prefix/field" key
+        self.groups = groups
+        self.signature = signature
+
+
+class SharedKnowledgeBase:
+    """
+    Read-only view over a blob written by build_knowledge_base.
+
+    The file is mapped with mmap, so every worker process shares the same page
+    cache pages instead of holding its own copy of the tables. Lookups return
+    memoryview slices into the mapping. When the file is atomically replaced,
+    the next lookup after `reload_interval` seconds maps the new version.
+    A replacement that cannot be mapped is logged and the current version
+    keeps being served.
+    """
+
+    def __init__(self, path: str, reload_interval: float = 1.0) -> None:
+        self.path = path
+        self.reload_interval = reload_interval
+        self._last_check = 0.0
+        self._failed_signature: Optional[Tuple[int, int, int]] = None
+        # Swapped as a single reference, so readers always see one consistent version
+        self._state: _Mapping = self._map()
+
+    @property
+    def version(self) -> Tuple[int, int, int]:
+        """
+        Signature of the currently mapped file; changes on every reload.
+        """
+        return self._state.signature
+
+    def _signature(self) -> Tuple[int, int, int]:
+        st = os.stat(self.path)
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _map(self) -> _Mapping:
+        with open(self.path, "rb") as f:
+            st = os.fstat(f.fileno())
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            size = len(mm)
+            if size < _HEADER.size:
+                raise ValueError(f"Knowledge base file is truncated: {self.path}")
+            magic, count, index_size = _HEADER.unpack_from(mm, 0)
+            if magic != MAGIC:
+                raise ValueError(f"Not a knowledge base file: {self.path}")
+            index_end = _HEADER.size + index_size
+            if index_end > size:
+                raise ValueError(f"Knowledge base index exceeds file size: {self.path}")
+
+            index: Dict[str, Tuple[int, int]] = {}
+            groups: Dict[str, List[Tuple[str, int, int]]] = {}
+            pos = _HEADER.size
+            for _ in range(count):
+                if pos + _ENTRY.size > index_end:
+                    raise ValueError(f"Knowledge base index is truncated: {self.path}")
+                key_len, offset, length = _ENTRY.unpack_from(mm, pos)
+                pos += _ENTRY.size
+                if pos + key_len > index_end or offset < index_end or offset + length > size:
+                    raise ValueError(f"Knowledge base entry out of bounds: {self.path}")
+                key = mm[pos:pos + key_len].decode("utf-8")
+                pos += key_len
+                index[key] = (offset, length)
+                if "/" in key:
+                    prefix, field_name = key.rsplit("/", 1)
+                    groups.setdefault(prefix, []).append((field_name, offset, length))
+        except Exception:
+            mm.close()
+            raise
+
+        self._last_check = time.monotonic()
+        return _Mapping(mm, index, groups, (st.st_ino, st.st_mtime_ns, st.st_size))
+
+    def maybe_reload(self) -> bool:
+        """
+        Remap the file if it has been replaced since it was last mapped.
+        Returns True when a new version was loaded.
+        """
+        now = time.monotonic()
+        if now - self._last_check < self.reload_interval:
+            return False
+        self._last_check = now
+
+        try:
+            signature = self._signature()
+        except OSError:
+            # Keep serving the current mapping while the file is being swapped.
+            return False
+        if signature == self._state.signature or signature == self._failed_signature:
+            return False
+
+        try:
+            state = self._map()
+        except (OSError, ValueError, struct.error) as e:
+            # Keep serving the current version; retry once the file changes again.
+            self._failed_signature = signature
+            log_event(
+                agent_name="SharedKnowledgeBase",
+                event_type="reload_failed",
+                data={"path": self.path, "error": str(e)},
+                severity="error",
+            )
+            return False
+
+        # The old mapping is released once outstanding views are dropped.
+        self._state = state
+        self._failed_signature = None
+        return True
+
+    def keys(self, prefix: str = "") -> List[str]:
+        self.maybe_reload()
+        return [key for key in self._state.index if key.startswith(prefix)]
+
+    def view(self, key: str) -> Optional[memoryview]:
+        """
+        Zero-copy view of the UTF-8 value stored under `key`, or None if missing.
+        """
+        self.maybe_reload()
+        state = self._state
+        location = state.index.get(key)
+        if location is None:
+            return None
+        offset, length = location
+        return memoryview(state.mm)[offset:offset + length]
+
+    def get_text(self, key: str) -> Optional[str]:
+        value = self.view(key)
+        if value is None:
+            return None
+        return str(value, "utf-8")
+
+    def get_mapping(self, prefix: str) -> Dict[str, str]:
+        """
+        Return every `prefix/<field>` entry as a {field: text} dict,
+        read from a single version of the file.
+        """
+        self.maybe_reload()
+        state = self._state
+        buffer = memoryview(state.mm)
+        mapping: Dict[str, str] = {}
+        for field_name, offset, length in state.groups.get(prefix.rstrip("/"), []):
+            mapping[field_name] = str(buffer[offset:offset + length], "utf-8")
+        return mapping
@@ -1,4 +1,154 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
+
+from project.tools.knowledge_base import SharedKnowledgeBase, build_knowledge_base
+
+
+# Read-only knowledge tables. Worker processes can share these through a
+# SharedKnowledgeBase blob (see use_shared_knowledge_base) instead of each
+# holding its own copy.
+PROTOCOLS: Dict[str, str] = {
+    "medical": (
+        "If possible, stay calm and ensure the area is safe. "
+        "Check if the person is responsive and breathing. "
+        "If there is severe bleeding, apply firm pressure with a clean cloth. "
+        "Do not give food or drink if the person is unconscious. "
+        "Call local emergency services as soon as you can."
+    ),
+    "fire": (
+        "If there is a safe exit, move away from the fire immediately. "
+        "Stay low to avoid smoke. "
+        "Do not use elevators. "
+        "If your clothes catch fire, stop, drop, and roll. "
+        "Once safe, call local emergency services."
+    ),
+    "earthquake": (
+        "If you are indoors, drop, cover, and hold on. "
+        "Stay away from windows and heavy objects that could fall. "
+        "Do not use elevators. "
+        "After the shaking stops, carefully move to a safer open area if it is safe to do so. "
+        "Check yourself and others for injuries."
+    ),
+    "flood": (
+        "Move to higher ground away from floodwater if you can do so safely. "
+        "Avoid walking or driving through moving water. "
+        "Do not touch electrical equipment if you are wet or standing in water. "
+        "Listen for local alerts and instructions."
+    ),
+    "storm": (
+        "Stay indoors and away from windows. "
+        "Secure loose objects outside if there is time and it can be done safely. "
+        "Avoid using corded electrical devices during lightning. "
+        "Monitor local alerts and be ready to move to a safer location if instructed."
+    ),
+    "general": (
+        "Stay as safe as possible and move away from immediate danger if you can. "
+        "Avoid taking unnecessary risks. "
+        "Contact local emergency services if you are in danger or unsure what to do."
+    ),
+}
+
+# Checked in order; the first region key whose keywords match wins.
+CONTACT_REGION_KEYWORDS: List[Tuple[str, List[str]]] = [
+    ("europe", ["europe", "eu", "germany", "france", "spain", "italy"]),
+    ("usa", ["usa", "united states", "america", "canada"]),
+    ("uk", ["uk", "united kingdom", "england", "scotland", "wales"]),
+]
+
+CONTACTS: Dict[str, Dict[str, str]] = {
+    "europe": {
+        "emergency_number": "112",
+        "note": "112 is the general emergency number in many European countries.",
+    },
+    "usa": {
+        "emergency_number": "911",
+        "note": "911 is the general emergency number in the United States and some other regions.",
+    },
+    "uk": {
+        "emergency_number": "999",
+        "note": "999 is the general emergency number in the UK.",
+    },
+    "default": {
+        "emergency_number": "local emergency number",
+        "note": "Contact your local emergency number. If you are unsure, look for official guidance in your country.",
+    },
+}
+
+DEFAULT_ALERT: Dict[str, str] = {
+    "level": "information",
+    "message": "Always follow official alerts and instructions from local authorities.",
+}
+
+# Added by the Worker when the risk score indicates a life-threatening situation.
+LIFE_THREATENING_WARNING = (
+    "This situation appears potentially life-threatening. Call your local emergency number immediately if you can."
+)
+
+# Blob entry holding the ordered region keyword table, one "key: kw1, kw2" line per region.
+CONTACT_REGIONS_KEY = "contact_regions"
+
+_SHARED_KB: Optional[SharedKnowledgeBase] = None
+# (blob version, parsed region keywords), re-parsed only when the blob is reloaded
+_SHARED_REGION_KEYWORDS: Optional[Tuple[Tuple[int, int, int], List[Tuple[str, List[str]]]]] = None
+
+
+def _encode_region_keywords(table: List[Tuple[str, List[str]]]) -> str:
+    return "\n".join([f"{key}: {', '.join(keywords)}" for key, keywords in table])
+
+
+def _decode_region_keywords(text: str) -> List[Tuple[str, List[str]]]:
+    table: List[Tuple[str, List[str]]] = []
+    for line in text.splitlines():
+        key, _, keywords = line.partition(":")
+        table.append((key.strip(), [k.strip() for k in keywords.split(",") if k.strip()]))
+    return table
+
+
+def _region_keywords() -> List[Tuple[str, List[str]]]:
+    global _SHARED_REGION_KEYWORDS
+    kb = _SHARED_KB
+    if kb is None:
+        return CONTACT_REGION_KEYWORDS
+
+    text = kb.get_text(CONTACT_REGIONS_KEY)
+    if text is None:
+        return CONTACT_REGION_KEYWORDS
+    cached = _SHARED_REGION_KEYWORDS
+    if cached is None or cached[0] != kb.version:
+        cached = (kb.version, _decode_region_keywords(text))
+        _SHARED_REGION_KEYWORDS = cached
+    return cached[1]
+
+
+def export_knowledge_base(path: str) -> None:
+    """
+    Write the built-in tables to a shared knowledge base blob at `path`.
+    Re-running this against a live path hot-reloads attached workers.
+    """
+    entries: Dict[str, str] = {}
+    for emergency_type, text in PROTOCOLS.items():
+        entries[f"protocol/{emergency_type}"] = text
+    for region_key, contact in CONTACTS.items():
+        for field_name, value in contact.items():
+            entries[f"contacts/{region_key}/{field_name}"] = value
+    for field_name, value in DEFAULT_ALERT.items():
+        entries[f"alerts/default/{field_name}"] = value
+    entries[CONTACT_REGIONS_KEY] = _encode_region_keywords(CONTACT_REGION_KEYWORDS)
+    build_knowledge_base(path, entries)
+
+
+def use_shared_knowledge_base(path: Optional[str], reload_interval: float = 1.0) -> None:
+    """
+    Serve tool lookups from the shared blob at `path` (None detaches it and
+    falls back to the in-process tables).
+
+    Protocols, contacts, alerts and the region keyword table are all read from
+    the blob, so a hot reload can add regions and protocols. The built-in
+    tables above are only seed data and a fallback. They are still imported
+    in every worker, so a large knowledge base should be built directly with
+    build_knowledge_base rather than added to these dicts.
+    """
+    global _SHARED_KB
+    _SHARED_KB = SharedKnowledgeBase(path, reload_interval=reload_interval) if path else None
 
 
 def get_emergency_protocol(
@@ -17,50 +167,14 @@ def get_emergency_protocol(
     emergency_type = emergency_type.lower()
     severity = severity.lower()
 
-    if emergency_type == "medical":
-        return (
-            "If possible, stay calm and ensure the area is safe. "
-            "Check if the person is responsive and breathing. "
-            "If there is severe bleeding, apply firm pressure with a clean cloth. "
-            "Do not give food or drink if the person is unconscious. "
-            "Call local emergency services as soon as you can."
-        )
-    if emergency_type == "fire":
-        return (
-            "If there is a safe exit, move away from the fire immediately. "
-            "Stay low to avoid smoke. "
-            "Do not use elevators. "
-            "If your clothes catch fire, stop, drop, and roll. "
-            "Once safe, call local emergency services."
-        )
-    if emergency_type == "earthquake":
-        return (
-            "If you are indoors, drop, cover, and hold on. "
-            "Stay away from windows and heavy objects that could fall. "
-            "Do not use elevators. "
-            "After the shaking stops, carefully move to a safer open area if it is safe to do so. "
-            "Check yourself and others for injuries."
-        )
-    if emergency_type == "flood":
-        return (
-            "Move to higher ground away from floodwater if you can do so safely. "
-            "Avoid walking or driving through moving water. "
-            "Do not touch electrical equipment if you are wet or standing in water. "
-            "Listen for local alerts and instructions."
-        )
-    if emergency_type == "storm":
-        return (
-            "Stay indoors and away from windows. "
-            "Secure loose objects outside if there is time and it can be done safely. "
-            "Avoid using corded electrical devices during lightning. "
-            "Monitor local alerts and be ready to move to a safer location if instructed."
-        )
-
-    return (
-        "Stay as safe as possible and move away from immediate danger if you can. "
-        "Avoid taking unnecessary risks. "
-        "Contact local emergency services if you are in danger or unsure what to do."
-    )
+    if _SHARED_KB is not None:
+        text = _SHARED_KB.get_text(f"protocol/{emergency_type}")
+        if text is None:
+            text = _SHARED_KB.get_text("protocol/general")
+        if text is not None:
+            return text
+
+    return PROTOCOLS.get(emergency_type, PROTOCOLS["general"])
 
 
 def get_local_emergency_contacts(region: str) -> Dict[str, Any]:
@@ -70,26 +184,18 @@ def get_local_emergency_contacts(region: str) -> Dict[str, Any]:
     """
     region_lower = region.lower()
 
-    if any(k in region_lower for k in ["europe", "eu", "germany", "france", "spain", "italy"]):
-        return {
-            "emergency_number": "112",
-            "note": "112 is the general emergency number in many European countries.",
-        }
-    if any(k in region_lower for k in ["usa", "united states", "america", "canada"]):
-        return {
-            "emergency_number": "911",
-            "note": "911 is the general emergency number in the United States and some other regions.",
-        }
-    if any(k in region_lower for k in ["uk", "united kingdom", "england", "scotland", "wales"]):
-        return {
-            "emergency_number": "999",
-            "note": "999 is the general emergency number in the UK.",
-        }
+    region_key = "default"
+    for key, keywords in _region_keywords():
+        if any(k in region_lower for k in keywords):
+            region_key = key
+            break
 
-    return {
-        "emergency_number": "local emergency number",
-        "note": "Contact your local emergency number. If you are unsure, look for official guidance in your country.",
-    }
+    if _SHARED_KB is not None:
+        contact = _SHARED_KB.get_mapping(f"contacts/{region_key}")
+        if contact:
+            return contact
+
+    return dict(CONTACTS.get(region_key, CONTACTS["default"]))
 
 
 def get_disaster_alerts(region: str, emergency_type: str) -> List[Dict[str, Any]]:
@@ -98,12 +204,17 @@ def get_disaster_alerts(region: str, emergency_type: str) -> List[Dict[str, Any]
     In a real system this might call weather or disaster alert APIs.
     For this project, return a simple mock alert list.
     """
+    alert = DEFAULT_ALERT
+    if _SHARED_KB is not None:
+        # Fields missing from the blob fall back to the built-in alert
+        alert = {**DEFAULT_ALERT, **_SHARED_KB.get_mapping("alerts/default")}
+
     return [
         {
             "region": region,
             "type": emergency_type,
-            "level": "information",
-            "message": "Always follow official alerts and instructions from local authorities.",
+            "level": alert["level"],
+            "message": alert["message"],
         }
     ]
 